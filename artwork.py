@@ -156,7 +156,7 @@ async def _update_vdf_icon(vdf_path: str, app_id: int, icon_path: str) -> bool:
     return False
 
 
-def apply_from_data(app_id: int, artwork_type: str, data: bytes, content_type: str) -> None:
+def apply_from_data(app_id: int, artwork_type: str, data: bytes | memoryview, content_type: str) -> None:
     """Write raw artwork bytes to the Steam grid directory.
 
     Mirrors the Go agent's artwork.ApplyFromData — same naming convention,
@@ -73,7 +73,7 @@ if errorlevel 1 (
 echo Copying files...
 copy /y plugin.json "%BUILD_DIR%\" >nul
 copy /y package.json "%BUILD_DIR%\" >nul
-for %%f in (main.py steam_utils.py mdns_service.py pairing.py upload.py artwork.py ws_server.py) do (
+for %%f in (main.py steam_utils.py mdns_service.py pairing.py upload.py artwork.py ws_server.py json_codec.py) do (
     copy /y "%%f" "%BUILD_DIR%\" >nul
 )
 copy /y requirements.txt "%BUILD_DIR%\" >nul
@@ -72,7 +72,7 @@ python3 -m pip install --target py_modules -r requirements.txt --no-cache-dir
 echo "Copying files..."
 cp plugin.json "$BUILD_DIR/"
 cp package.json "$BUILD_DIR/"
-for pyfile in main.py steam_utils.py mdns_service.py pairing.py upload.py artwork.py ws_server.py telemetry.py console_log.py game_log.py tcp_server.py; do
+for pyfile in main.py steam_utils.py mdns_service.py pairing.py upload.py artwork.py ws_server.py telemetry.py console_log.py game_log.py tcp_server.py json_codec.py; do
     cp "$pyfile" "$BUILD_DIR/"
 done
 
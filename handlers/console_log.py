@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import uuid
 from typing import TYPE_CHECKING
 
 import decky  # type: ignore
 
+import json_codec
+
 if TYPE_CHECKING:
     from ws_server import WebSocketServer
 
@@ -61,7 +62,7 @@ def _make_console_callback(server: WebSocketServer):
             "type": "console_log_data",
             "payload": batch,
         }
-        await server._send_queue.put(json.dumps(msg))
+        server._send_queue.offer(json_codec.dumpb(msg))
     return _send_console_log_data
 
 
@@ -80,7 +81,7 @@ async def send_console_log_status(server: WebSocketServer) -> None:
             "levelMask": level_mask,
         },
     }
-    await server._send_queue.put(json.dumps(msg))
+    server._send_queue.put_nowait(json_codec.dumpb(msg))
 
 
 # ── Game log lifecycle ────────────────────────────────────────────────────
@@ -109,5 +110,5 @@ def _make_game_log_callback(server: WebSocketServer):
             "type": "console_log_data",
             "payload": batch,
         }
-        await server._send_queue.put(json.dumps(msg))
+        server._send_queue.offer(json_codec.dumpb(msg))
     return _send_game_log_data
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import shutil
+import subprocess
 from typing import TYPE_CHECKING
 
 import decky  # type: ignore
@@ -16,16 +19,17 @@ async def handle_list_shortcuts(
 ) -> None:
     """Return shortcuts from tracked data (SteamClient writes VDF lazily)."""
     tracked = server.plugin.settings.getSetting("tracked_shortcuts", [])
-    shortcuts = []
-    for sc in tracked:
-        shortcuts.append({
+    shortcuts = [
+        {
             "appId": sc.get("appId", 0),
             "name": sc.get("name", ""),
             "exe": sc.get("exe", ""),
             "startDir": sc.get("startDir", ""),
             "launchOptions": "",
             "lastPlayed": 0,
-        })
+        }
+        for sc in tracked
+    ]
     await server.send(websocket, msg_id, "shortcuts_response", {"shortcuts": shortcuts})
 
 
@@ -33,12 +37,12 @@ async def handle_delete_game(
     server: WebSocketServer, websocket, msg_id: str, payload: dict
 ) -> None:
     """Delete a game completely (like Go agent's handleDeleteGame)."""
-    import shutil
-
     app_id = payload.get("appId", 0)
     tracked = server.plugin.settings.getSetting("tracked_shortcuts", [])
 
-    # Find game by appId
+    # Find game by appId. A plain scan on purpose: the persisted list is the
+    # source of truth (unregistered shortcuts share appId 0) and is rewritten
+    # below anyway, so an appId index would only add state to keep coherent.
     game = None
     for sc in tracked:
         if sc.get("appId") == app_id:
@@ -64,7 +68,8 @@ async def handle_delete_game(
     start_dir = game.get("startDir", "").strip('"')
     if start_dir and os.path.isdir(start_dir):
         try:
-            shutil.rmtree(start_dir)
+            # Multi-GB trees take seconds to unlink — keep the loop responsive.
+            await asyncio.to_thread(shutil.rmtree, start_dir)
             decky.logger.info(f"Deleted game folder: {start_dir}")
         except Exception as e:
             decky.logger.error(f"Failed to delete game folder: {e}")
@@ -72,7 +77,8 @@ async def handle_delete_game(
     # Notify frontend to remove Steam shortcut via SteamClient.Apps.RemoveShortcut
     await server.plugin.notify_frontend("remove_shortcut", {"appId": app_id})
 
-    # Remove from tracked list
+    # Remove from tracked list (re-read: it may have changed while deleting)
+    tracked = server.plugin.settings.getSetting("tracked_shortcuts", [])
     tracked = [sc for sc in tracked if sc.get("appId") != app_id]
     server.plugin.settings.setSetting("tracked_shortcuts", tracked)
 
@@ -96,8 +102,6 @@ async def handle_restart_steam(
     server: WebSocketServer, websocket, msg_id: str, payload: dict
 ) -> None:
     """Gracefully shutdown Steam. In Gaming Mode the session manager restarts it automatically."""
-    import subprocess
-
     try:
         subprocess.Popen(
             ["steam", "-shutdown"],
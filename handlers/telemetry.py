@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
-import json
-import uuid
+import itertools
 from typing import TYPE_CHECKING
 
 import decky  # type: ignore
 
+import json_codec
+
 if TYPE_CHECKING:
     from ws_server import WebSocketServer
 
+# Telemetry messages are unsolicited and never correlated by the Hub, so a
+# process-wide counter is enough; uuid4 costs an os.urandom call per tick.
+_msg_seq = itertools.count(1)
+
 
 def start_telemetry(server: WebSocketServer, interval: float) -> None:
     """Start sending telemetry data to the connected Hub."""
@@ -32,11 +37,11 @@ def _make_send_callback(server: WebSocketServer):
         if not server.connected_hub or not server._send_queue:
             return
         msg = {
-            "id": str(uuid.uuid4()),
+            "id": f"tel-{next(_msg_seq)}",
             "type": "telemetry_data",
             "payload": data,
         }
-        await server._send_queue.put(json.dumps(msg))
+        server._send_queue.offer(json_codec.dumpb(msg))
     return _send_telemetry_data
 
 
@@ -45,11 +50,11 @@ async def send_telemetry_status(server: WebSocketServer) -> None:
     if not server.connected_hub or not server._send_queue:
         return
     msg = {
-        "id": str(uuid.uuid4()),
+        "id": f"tel-{next(_msg_seq)}",
         "type": "telemetry_status",
         "payload": {
             "enabled": server.plugin.settings.getSetting("telemetry_enabled", False),
             "interval": server.plugin.settings.getSetting("telemetry_interval", 2),
         },
     }
-    await server._send_queue.put(json.dumps(msg))
+    server._send_queue.put_nowait(json_codec.dumpb(msg))
@@ -4,16 +4,18 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
 import os
 import random
+import shutil
+import struct
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import decky  # type: ignore
 
+import json_codec
 from artwork import download_artwork, apply_from_data
-from steam_utils import expand_path
 from tcp_server import TcpDataServer
 from upload import UploadSession
 
@@ -22,6 +24,30 @@ if TYPE_CHECKING:
 
 CHUNK_SIZE = 1024 * 1024  # 1MB
 
+# Chunk-path progress notifications: at most one per this many chunks or
+# this many seconds (the final chunk always notifies).
+PROGRESS_NOTIFY_CHUNKS = 64
+PROGRESS_NOTIFY_INTERVAL = 0.1
+
+# upload_chunk_response is sent once per chunk; same bytes send() would
+# produce for the equivalent dict, minus the dict and encoder pass.
+_CHUNK_RESPONSE = (
+    b'{"id":%s,"type":"upload_chunk_response",'
+    b'"payload":{"uploadId":%s,"bytesWritten":%d,"totalWritten":%d}}'
+)
+
+# Legacy JSON upload_chunk with inline base64 data. Deprecated: chunks travel
+# as binary frames (or over the TCP data channel); set this env var to accept
+# the old path for one more release.
+_ALLOW_B64_CHUNKS = bool(os.environ.get("CAPYDEPLOY_ALLOW_B64_CHUNKS"))
+
+# Binary frame prefix: header length, 4 bytes big-endian.
+_HEADER_LEN = struct.Struct(">I")
+
+# Small dedicated pool for chunk writes so disk stalls never queue behind
+# (or block) the loop's default executor.
+_WRITE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="upload-io")
+
 
 def _validate_safe_path(file_path: str) -> None:
     """Validate that a relative path does not escape its base directory.
@@ -40,6 +66,32 @@ def _validate_safe_path(file_path: str) -> None:
         raise ValueError(f"parent directory traversal not allowed: {file_path}")
 
 
+def _precreate_dirs(install_path: str, files: list) -> set[str]:
+    """Create every parent directory named in the init file list.
+
+    Entries are FileEntry dicts ({"relativePath": ..., "size": ...}); unsafe
+    or malformed paths are skipped here and rejected later by the chunk path.
+    Returns the set of directories that now exist.
+    """
+    dirs = {install_path}
+    for entry in files:
+        if isinstance(entry, dict):
+            rel = entry.get("relativePath") or entry.get("path")
+        else:
+            rel = entry
+        if not isinstance(rel, str):
+            continue
+        try:
+            _validate_safe_path(rel)
+        except ValueError:
+            continue
+        dirs.add(os.path.dirname(os.path.join(install_path, rel)))
+
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+    return dirs
+
+
 async def handle_init_upload(
     server: WebSocketServer, websocket, msg_id: str, payload: dict
 ) -> None:
@@ -57,12 +109,14 @@ async def handle_init_upload(
 
     upload_id = f"upload-{int(time.time())}-{random.randint(1000, 9999)}"
     session = UploadSession(upload_id, game_name, total_size, files)
-    expanded = expand_path(server.plugin.install_path)
-    session.install_path = os.path.join(expanded, game_name)
+    session.install_path = os.path.join(server.plugin.install_path_expanded, game_name)
     session.executable = config.get("executable", "")
     server.uploads[upload_id] = session
 
-    os.makedirs(session.install_path, exist_ok=True)
+    # One pass over the manifest up front, so chunk writes never makedirs.
+    session.mkdir_cache = await asyncio.get_running_loop().run_in_executor(
+        _WRITE_POOL, _precreate_dirs, session.install_path, files
+    )
 
     decky.logger.info(f"Upload started: {game_name} ({total_size} bytes) -> {session.install_path}")
     await server.plugin.notify_frontend("operation_event", {
@@ -137,9 +191,51 @@ async def handle_init_upload(
         asyncio.create_task(_tcp_receive())
 
 
+def _get_fd(session: UploadSession, file_path: str, offset: int) -> int:
+    """Return the session's cached write fd for file_path, opening it once.
+
+    The Hub sends files one after another, so moving on to a new path closes
+    the previous fd; open fds stay bounded however many files the game has.
+    Raises RuntimeError once the session has been completed or cancelled.
+    """
+    if session.status != "active":
+        raise RuntimeError(f"upload {session.id} is {session.status}")
+    fd = session.fds.get(file_path)
+    if fd is not None:
+        return fd
+    if session.fds:
+        session.close_files()
+
+    full_path = os.path.join(session.install_path, file_path)
+    dirname = os.path.dirname(full_path)
+    if dirname not in session.mkdir_cache:
+        os.makedirs(dirname, exist_ok=True)
+        session.mkdir_cache.add(dirname)
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC
+    if offset == 0:
+        # First chunk of a fresh file — drop any stale contents.
+        flags |= os.O_TRUNC
+    fd = os.open(full_path, flags, 0o644)
+    session.fds[file_path] = fd
+    return fd
+
+
+def _write_file_chunk(
+    session: UploadSession, file_path: str, offset: int, chunk_data: bytes | memoryview
+) -> None:
+    """Blocking part of a chunk write (runs off the event loop)."""
+    fd = _get_fd(session, file_path, offset)
+    view = memoryview(chunk_data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
 async def _write_chunk(
     server: WebSocketServer, websocket, msg_id: str,
-    upload_id: str, file_path: str, offset: int, chunk_data: bytes
+    upload_id: str, file_path: str, offset: int, chunk_data: bytes | memoryview
 ) -> None:
     """Write a chunk to disk and emit progress. Shared by JSON and binary paths."""
     session = server.uploads.get(upload_id)
@@ -153,42 +249,72 @@ async def _write_chunk(
         await server.send_error(websocket, msg_id, 400, f"invalid file path: {e}")
         return
 
-    full_path = os.path.join(session.install_path, file_path)
-    os.makedirs(os.path.dirname(full_path), exist_ok=True)
-
-    with open(full_path, "ab" if offset > 0 else "wb") as f:
-        f.seek(offset)
-        f.write(chunk_data)
+    # Disk I/O runs on a worker thread so pings, acks and telemetry keep
+    # flowing while the kernel flushes dirty pages. The future is kept on
+    # the session so cancel/cleanup can wait for it before closing fds.
+    future = asyncio.get_running_loop().run_in_executor(
+        _WRITE_POOL, _write_file_chunk, session, file_path, offset, chunk_data
+    )
+    session.write_future = future
+    try:
+        await future
+    except Exception:
+        if session.status == "active":
+            raise
+    finally:
+        if session.write_future is future:
+            session.write_future = None
+
+    # Cancelled (or cleaned up) while the write ran: no progress, no ack.
+    if server.uploads.get(upload_id) is not session or session.status != "active":
+        return
 
-    session.transferred += len(chunk_data)
+    # Session fields are read once into locals; the hot path below only
+    # writes back what changed.
+    size = len(chunk_data)
+    transferred = session.transferred + size
+    session.transferred = transferred
     session.current_file = file_path
 
-    progress = session.progress()
-    await server.plugin.notify_frontend("upload_progress", {
-        "uploadId": upload_id,
-        "transferredBytes": session.transferred,
-        "totalBytes": session.total_size,
-        "currentFile": file_path,
-        "percentage": progress,
-    })
+    pending = session.chunks_since_notify + 1
+    now = time.monotonic()
+    if (
+        transferred >= session.total_size
+        or pending >= PROGRESS_NOTIFY_CHUNKS
+        or now - session.last_notify_ts >= PROGRESS_NOTIFY_INTERVAL
+    ):
+        session.last_notify_ts = now
+        session.chunks_since_notify = 0
+        await server.plugin.notify_frontend("upload_progress", {
+            "uploadId": upload_id,
+            "transferredBytes": transferred,
+            "totalBytes": session.total_size,
+            "currentFile": file_path,
+            "percentage": session.progress(),
+        })
+    else:
+        session.chunks_since_notify = pending
 
-    await server.send(websocket, msg_id, "upload_chunk_response", {
-        "uploadId": upload_id,
-        "bytesWritten": len(chunk_data),
-        "totalWritten": session.transferred,
-    })
+    server.send_raw(_CHUNK_RESPONSE % (
+        json_codec.dumpb(msg_id), json_codec.dumpb(upload_id), size, transferred,
+    ))
 
 
 async def handle_upload_chunk(
     server: WebSocketServer, websocket, msg_id: str, payload: dict
 ) -> None:
-    """Handle a chunk upload (JSON path)."""
+    """Handle a chunk upload (JSON path, deprecated in favour of binary frames)."""
+    if not _ALLOW_B64_CHUNKS:
+        await server.send_error(websocket, msg_id, 400, "Use binary frame for chunk data")
+        return
+
     upload_id = payload.get("uploadId", "")
     file_path = payload.get("filePath", "")
     offset = payload.get("offset", 0)
     data = payload.get("data", b"")
 
     if isinstance(data, str):
+        decky.logger.warning("Deprecated base64 upload_chunk received")
         data = base64.b64decode(data)
 
     await _write_chunk(server, websocket, msg_id, upload_id, file_path, offset, data)
@@ -205,18 +331,20 @@ async def handle_binary(server: WebSocketServer, websocket, data: bytes) -> None
         decky.logger.error("Binary message too short")
         return
 
-    header_len = (data[0] << 24) | (data[1] << 16) | (data[2] << 8) | data[3]
-    if len(data) < 4 + header_len:
+    header_len = _HEADER_LEN.unpack_from(data, 0)[0]
+    body_start = 4 + header_len
+    if len(data) < body_start:
         decky.logger.error("Binary message header incomplete")
         return
 
     try:
-        header = json.loads(data[4:4 + header_len].decode('utf-8'))
+        header = json_codec.loads(data[4:body_start])
     except Exception as e:
         decky.logger.error(f"Invalid binary header: {e}")
         return
 
-    binary_data = data[4 + header_len:]
+    # View the payload instead of slicing: avoids copying ~1 MiB per chunk.
+    binary_data = memoryview(data)[body_start:]
     msg_type = header.get("type", "")
 
     if msg_type == "artwork_image":
@@ -229,17 +357,19 @@ async def handle_binary(server: WebSocketServer, websocket, data: bytes) -> None
     file_path = header.get("filePath", "")
     offset = header.get("offset", 0)
 
-    decky.logger.info(f"Binary chunk: {upload_id}/{file_path} offset={offset} size={len(binary_data)}")
+    decky.logger.debug(
+        "Binary chunk: %s/%s offset=%s size=%d", upload_id, file_path, offset, len(binary_data)
+    )
     await _write_chunk(server, websocket, msg_id, upload_id, file_path, offset, binary_data)
 
 
 async def _handle_binary_artwork(
-    server: WebSocketServer, websocket, header: dict, data: bytes
+    server: WebSocketServer, websocket, header: dict, data: memoryview
 ) -> None:
     """Handle artwork_image binary message.
 
-    When appId=0 (pre-CompleteUpload phase): store artwork as pending
-    base64 so handle_complete_upload can include it in create_shortcut.
+    When appId=0 (pre-CompleteUpload phase): hold the raw bytes as pending
+    so handle_complete_upload can base64 them into create_shortcut.
     When appId>0: write directly to Steam grid directory.
     """
     msg_id = header.get("id", "")
@@ -258,8 +388,8 @@ async def _handle_binary_artwork(
         if "jpeg" in content_type or "jpg" in content_type:
             fmt = "jpg"
 
-        b64 = base64.b64encode(data).decode("ascii")
-        server._pending_artwork[artwork_type] = {"data": b64, "format": fmt}
+        # Keep raw bytes; base64 happens once, only if a shortcut is created.
+        server._pending_artwork[artwork_type] = {"data": data, "format": fmt}
         decky.logger.info(f"Stored pending artwork: {artwork_type} ({len(data)} bytes)")
         await server.send(websocket, msg_id, "artwork_image_response", {
             "success": True,
@@ -297,6 +427,17 @@ async def _handle_binary_artwork(
         })
 
 
+def _encode_artwork(pending: dict) -> dict:
+    """Base64 raw pending artwork into the create_shortcut artwork shape."""
+    return {
+        art_type: {
+            "data": base64.b64encode(art["data"]).decode("ascii"),
+            "format": art["format"],
+        }
+        for art_type, art in pending.items()
+    }
+
+
 async def handle_complete_upload(
     server: WebSocketServer, websocket, msg_id: str, payload: dict
 ) -> None:
@@ -319,6 +460,7 @@ async def handle_complete_upload(
         session.tcp_server = None
 
     session.status = "complete"
+    await session.finish_writes()
     decky.logger.info(f"Upload complete: {session.game_name}")
 
     result = {
@@ -342,14 +484,17 @@ async def handle_complete_upload(
         if raw_artwork:
             artwork_b64 = await download_artwork(raw_artwork)
 
-        # Merge pending local artwork (received via binary WS before CompleteUpload)
+        # Pending local artwork (received via binary WS before CompleteUpload)
+        # is taken only once the downloads are done, so a failed download
+        # leaves it pending; it is base64'd in one worker pass.
         if server._pending_artwork:
-            decky.logger.info(
-                f"Merging {len(server._pending_artwork)} pending local artwork(s)"
-            )
-            for art_type, art_data in server._pending_artwork.items():
-                artwork_b64[art_type] = art_data
-            server._pending_artwork.clear()
+            # Swap rather than copy+clear: the worker owns the old dict.
+            pending, server._pending_artwork = server._pending_artwork, {}
+            decky.logger.info(f"Merging {len(pending)} pending local artwork(s)")
+            # Local artwork wins over downloaded artwork of the same type.
+            artwork_b64.update(await asyncio.get_running_loop().run_in_executor(
+                None, _encode_artwork, pending
+            ))
 
         # Pass icon URL directly (backend will download it after shortcut creation)
         icon_url = raw_artwork.get("icon", "")
@@ -389,8 +534,6 @@ async def handle_cancel_upload(
     server: WebSocketServer, websocket, msg_id: str, payload: dict
 ) -> None:
     """Cancel an active upload."""
-    import shutil
-
     upload_id = payload.get("uploadId", "")
     session = server.uploads.get(upload_id)
 
@@ -402,12 +545,13 @@ async def handle_cancel_upload(
             session.tcp_server = None
 
         session.status = "cancelled"
+        await session.finish_writes()
         if session.install_path and os.path.exists(session.install_path):
             try:
-                shutil.rmtree(session.install_path)
+                await asyncio.to_thread(shutil.rmtree, session.install_path)
             except Exception as e:
                 decky.logger.error(f"Failed to cleanup cancelled upload: {e}")
-        del server.uploads[upload_id]
+        server.uploads.pop(upload_id, None)
         decky.logger.info(f"Upload cancelled: {game_name}")
 
         # Notify Decky frontend so the UI updates.
@@ -424,8 +568,6 @@ async def handle_cancel_upload(
 
 async def cleanup_orphaned_uploads(server: WebSocketServer) -> None:
     """Cleanup incomplete uploads when client disconnects unexpectedly."""
-    import shutil
-
     orphaned = [
         uid for uid, session in server.uploads.items()
         if session.status == "active"
@@ -435,14 +577,16 @@ async def cleanup_orphaned_uploads(server: WebSocketServer) -> None:
         session = server.uploads.get(upload_id)
         if session:
             decky.logger.warning(f"Cleaning orphaned upload: {session.game_name}")
+            session.status = "cancelled"
+            await session.finish_writes()
             # Remove partially uploaded files
             if session.install_path and os.path.exists(session.install_path):
                 try:
-                    shutil.rmtree(session.install_path)
+                    await asyncio.to_thread(shutil.rmtree, session.install_path)
                     decky.logger.info(f"Removed orphaned folder: {session.install_path}")
                 except Exception as e:
                     decky.logger.error(f"Failed to cleanup orphaned upload: {e}")
-            del server.uploads[upload_id]
+            server.uploads.pop(upload_id, None)
 
     if orphaned:
         decky.logger.info(f"Cleaned up {len(orphaned)} orphaned upload(s)")
@@ -0,0 +1,40 @@
+"""
+JSON encoding/decoding for WebSocket messages.
+Uses orjson when it is importable (much faster on the per-message hot path),
+otherwise stdlib json with compact separators.
+
+dumpb() returns UTF-8 bytes ready for a WebSocket text frame; loads() accepts
+str or bytes. Strings orjson refuses (surrogate-escaped filenames from
+os.listdir/Path.iterdir) go through stdlib json, which escapes them to ASCII.
+"""
+
+import json
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def _stdlib_dumpb(obj) -> bytes:
+    # ensure_ascii stays on: lone surrogates can't be encoded as UTF-8.
+    return _encoder.encode(obj).encode("ascii")
+
+
+if orjson is not None:
+    def dumpb(obj) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return _stdlib_dumpb(obj)
+
+    loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+else:
+    dumpb = _stdlib_dumpb
+    loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
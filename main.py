@@ -3,8 +3,10 @@ CapyDeploy Decky Plugin - Backend
 Thin entry point: all logic lives in dedicated modules.
 """
 
+import asyncio
 import json
 import os
+import shutil
 import sys
 import time
 from typing import Optional
@@ -77,6 +79,7 @@ class Plugin:
     agent_name: str
     accept_connections: bool
     install_path: str
+    install_path_expanded: str  # expand_path(install_path), kept in sync
     _frontend_ws = None
 
     # Events that MUST NOT be lost — use append queue instead of overwrite
@@ -112,6 +115,7 @@ class Plugin:
         self.agent_name = self.settings.getSetting("agent_name", "Steam Deck")
         self.accept_connections = self.settings.getSetting("accept_connections", True)
         self.install_path = self.settings.getSetting("install_path", "~/Games")
+        self.install_path_expanded = expand_path(self.install_path)
 
         # Get or generate agent ID
         stored_id = self.settings.getSetting("agent_id", None)
@@ -124,7 +128,7 @@ class Plugin:
             self.settings.setSetting("agent_id", self.agent_id)
 
         # Ensure install path exists
-        os.makedirs(expand_path(self.install_path), exist_ok=True)
+        os.makedirs(self.install_path_expanded, exist_ok=True)
 
         # Start server if enabled
         if self.settings.getSetting("enabled", False):
@@ -246,8 +250,9 @@ class Plugin:
     async def set_install_path(self, path: str):
         """Set the install path."""
         self.install_path = path
+        self.install_path_expanded = expand_path(path)
         self.settings.setSetting("install_path", path)
-        os.makedirs(expand_path(path), exist_ok=True)
+        os.makedirs(self.install_path_expanded, exist_ok=True)
 
     async def set_telemetry_enabled(self, enabled=False):
         """Enable or disable telemetry sending."""
@@ -386,7 +391,6 @@ class Plugin:
 
     async def cancel_current_upload(self):
         """Cancel any active upload from the frontend UI."""
-        import shutil
         cancelled = False
         game_name = "Upload"
         for upload_id, session in list(self.ws_server.uploads.items()):
@@ -395,13 +399,17 @@ class Plugin:
             # Stop TCP data channel if running.
             if session.tcp_server:
                 await session.tcp_server.stop()
+            # A chunk write may be mid-flight on the upload-io pool; let it
+            # finish before its fd is closed and its directory removed.
+            session.status = "cancelled"
+            await session.finish_writes()
             # Cleanup partial files.
             if session.install_path and os.path.exists(session.install_path):
                 try:
-                    shutil.rmtree(session.install_path)
+                    await asyncio.to_thread(shutil.rmtree, session.install_path)
                 except Exception as e:
                     decky.logger.error(f"Failed to cleanup cancelled upload: {e}")
-            del self.ws_server.uploads[upload_id]
+            self.ws_server.uploads.pop(upload_id, None)
             cancelled = True
         if cancelled:
             # Notify Decky frontend.
@@ -425,7 +433,7 @@ class Plugin:
     async def get_installed_games(self):
         """Get list of games installed in the install path, with appId from tracked shortcuts."""
         games = []
-        expanded_path = expand_path(self.install_path)
+        expanded_path = self.install_path_expanded
         tracked = self.settings.getSetting("tracked_shortcuts", [])
 
         # Build name → appId lookup from tracked shortcuts
@@ -463,12 +471,11 @@ class Plugin:
 
     async def uninstall_game(self, game_name: str):
         """Remove a game folder and return its appId for shortcut removal."""
-        import shutil
-        expanded_path = expand_path(self.install_path)
+        expanded_path = self.install_path_expanded
         game_path = os.path.join(expanded_path, game_name)
         try:
             if os.path.exists(game_path) and os.path.isdir(game_path):
-                shutil.rmtree(game_path)
+                await asyncio.to_thread(shutil.rmtree, game_path)
                 decky.logger.info(f"Uninstalled game: {game_name}")
 
                 tracked = self.settings.getSetting("tracked_shortcuts", [])
@@ -4,6 +4,8 @@ All functions are module-level (no class required).
 """
 
 import os
+import socket
+import stat
 from pathlib import Path
 from typing import Optional
 
@@ -12,8 +14,6 @@ import decky  # type: ignore
 
 def get_local_ip() -> str:
     """Get the local non-loopback IP address."""
-    import socket
-
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
@@ -51,7 +51,6 @@ def detect_platform() -> str:
     # This avoids false positives on Bazzite which symlinks /home/deck
     try:
         info = os.lstat("/home/deck")
-        import stat
         if not stat.S_ISLNK(info.st_mode) and stat.S_ISDIR(info.st_mode):
             return "steamdeck"
     except Exception:
@@ -38,20 +38,35 @@ AUTH_REJECTED = 0x00
 TRANSFER_ACK = 0x02
 MD5_DIGEST_LEN = 16
 
+# Files at least this large have their page cache dropped once synced.
+FADVISE_MIN_SIZE = 1024 * 1024
+
 
 def _validate_path(path: str) -> None:
     """Validate a relative path for safety (no traversal, no absolute paths)."""
     if not path:
         raise ValueError("empty path")
 
-    if os.path.isabs(path):
+    if path[0] == "/":
         raise ValueError(f"absolute path not allowed: {path}")
 
-    normalized = os.path.normpath(path)
-    if normalized == ".." or normalized.startswith(".." + os.sep):
+    # Reject any ".." component outright instead of normalizing: stricter
+    # than the normpath check and allocation-free for well-formed paths.
+    if ".." in path and ".." in path.split("/"):
         raise ValueError(f"parent traversal not allowed: {path}")
 
 
+def _drop_page_cache(fd: int) -> None:
+    """Best-effort POSIX_FADV_DONTNEED; the hint is never worth failing a transfer."""
+    advice = getattr(os, "POSIX_FADV_DONTNEED", None)
+    if advice is None:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
 class TcpDataServer:
     """Ephemeral TCP server for receiving file data from the Hub."""
 
@@ -61,7 +76,7 @@ class TcpDataServer:
         self._token: str = ""
         self._cancel_event = asyncio.Event()
         self._done_event = asyncio.Event()
-        self._conn_future: Optional[asyncio.Future] = None
+        self._conn_queue: Optional[asyncio.Queue] = None
 
     @property
     def port(self) -> int:
@@ -77,15 +92,20 @@ class TcpDataServer:
         self._cancel_event.clear()
         self._done_event.clear()
 
-        loop = asyncio.get_event_loop()
-        self._conn_future = loop.create_future()
+        conn_queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._conn_queue = conn_queue
 
         async def _on_connect(reader, writer):
-            """Deliver the first connection to accept_and_receive."""
-            if self._conn_future and not self._conn_future.done():
-                self._conn_future.set_result((reader, writer))
-            else:
+            """Hand the first connection to accept_and_receive, reject the rest."""
+            try:
+                conn_queue.put_nowait((reader, writer))
+            except asyncio.QueueFull:
                 writer.close()
+                return
+            # Only one connection per transfer — stop listening right away.
+            if self._server:
+                self._server.close()
+                self._server = None
 
         server = await asyncio.start_server(_on_connect, "0.0.0.0", 0)
         self._server = server
@@ -103,12 +123,12 @@ class TcpDataServer:
 
         Returns total bytes received.
         """
-        if not self._conn_future:
+        if not self._conn_queue:
             raise RuntimeError("server not started")
 
         try:
-            reader, writer = await asyncio.wait_for(
-                self._conn_future, timeout=TCP_CONNECT_TIMEOUT
+            conn = await asyncio.wait_for(
+                self._conn_queue.get(), timeout=TCP_CONNECT_TIMEOUT
             )
         except asyncio.TimeoutError:
             raise TimeoutError("TCP data channel: connect timeout")
@@ -118,6 +138,11 @@ class TcpDataServer:
                 self._server.close()
                 self._server = None
 
+        if conn is None:
+            # stop() woke us up before the Hub connected.
+            raise asyncio.CancelledError("TCP data channel cancelled")
+        reader, writer = conn
+
         addr = writer.get_extra_info("peername")
         decky.logger.info(f"TCP data channel: connection from {addr}")
 
@@ -163,6 +188,8 @@ class TcpDataServer:
         # Receive files.
         total_bytes = 0
         os.makedirs(install_path, exist_ok=True)
+        # Directories already created — avoids one makedirs per file.
+        seen_dirs = {install_path}
 
         while True:
             if self._cancel_event.is_set():
@@ -190,7 +217,10 @@ class TcpDataServer:
 
             # Write file to disk.
             full_path = os.path.join(install_path, relative_path)
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            parent_dir = os.path.dirname(full_path)
+            if parent_dir not in seen_dirs:
+                os.makedirs(parent_dir, exist_ok=True)
+                seen_dirs.add(parent_dir)
 
             remaining = file_size
             hasher = hashlib.md5()
@@ -213,6 +243,11 @@ class TcpDataServer:
                 f.flush()
                 os.fsync(f.fileno())
 
+                # Data is on disk — release its page cache so multi-GB
+                # transfers don't evict pages the running game needs.
+                if file_size >= FADVISE_MIN_SIZE:
+                    _drop_page_cache(f.fileno())
+
             # Verify MD5 checksum.
             expected_md5 = await reader.readexactly(MD5_DIGEST_LEN)
             actual_md5 = hasher.digest()
@@ -252,8 +287,13 @@ class TcpDataServer:
     async def stop(self):
         """Close listener and cancel pending accept."""
         self._cancel_event.set()
-        if self._conn_future and not self._conn_future.done():
-            self._conn_future.cancel()
+        if self._conn_queue:
+            # Wake a pending accept_and_receive; a no-op if a connection
+            # is already queued (the cancel event stops that one).
+            try:
+                self._conn_queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
         if self._server:
             self._server.close()
             try:
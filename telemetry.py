@@ -7,9 +7,10 @@ Produces the same JSON structure as the Desktop Agent (Go).
 from __future__ import annotations
 
 import asyncio
-import glob
+import errno
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Awaitable, Optional
 
 import decky  # type: ignore
@@ -18,6 +19,18 @@ import decky  # type: ignore
 class TelemetryCollector:
     """Collects hardware metrics from sysfs/procfs at a configurable interval."""
 
+    __slots__ = (
+        "_task", "_interval", "_send_fn",
+        "_prev_idle", "_prev_total", "_primed",
+        "_cpu_temp_path", "_gpu_busy_path", "_gpu_temp_path",
+        "_gpu_freq_path", "_gpu_mem_freq_path",
+        "_vram_used_path", "_vram_total_path",
+        "_power_cap_path", "_power_avg_path", "_fan_path",
+        "_bat_capacity_path", "_bat_status_path",
+        "_cpu_freq_paths", "_cpu_freq_fds", "_paths_resolved", "_paths_stale",
+        "_fds", "_executor",
+    )
+
     def __init__(self) -> None:
         self._task: Optional[asyncio.Task] = None
         self._interval: float = 2.0
@@ -39,9 +52,22 @@ class TelemetryCollector:
         self._power_cap_path: Optional[str] = None
         self._power_avg_path: Optional[str] = None
         self._fan_path: Optional[str] = None
-        self._battery_path: Optional[str] = None
+        self._bat_capacity_path: Optional[str] = None
+        self._bat_status_path: Optional[str] = None
         self._cpu_freq_paths: list[str] = []
+        self._cpu_freq_fds: list[int] = []
         self._paths_resolved: bool = False
+        # Set when a cached node vanished (device re-enumerated) — re-resolve
+        self._paths_stale: bool = False
+
+        # Open fds for the resolved nodes, re-read with pread every tick
+        self._fds: dict[str, int] = {}
+
+        # Single worker thread: sysfs reads stay off the event loop, and
+        # fd teardown is serialized behind any in-flight collection.
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="telemetry"
+        )
 
     def start(self, interval: float, send_fn: Callable[[dict], Awaitable[None]]) -> None:
         """Start the collection loop."""
@@ -52,7 +78,7 @@ class TelemetryCollector:
         self._primed = False
         self._prev_idle = 0
         self._prev_total = 0
-        self._task = asyncio.get_event_loop().create_task(self._loop())
+        self._task = asyncio.get_running_loop().create_task(self._loop())
         decky.logger.info(f"Telemetry collector started (interval={self._interval}s)")
 
     def stop(self) -> None:
@@ -61,6 +87,7 @@ class TelemetryCollector:
             self._task.cancel()
             self._task = None
             decky.logger.info("Telemetry collector stopped")
+        self._executor.submit(self._close_fds)
 
     def update_interval(self, seconds: float) -> None:
         """Update interval — restarts the loop if running."""
@@ -76,16 +103,35 @@ class TelemetryCollector:
     # ── Internal loop ────────────────────────────────────────────────────────
 
     async def _loop(self) -> None:
+        # Bound once: start() always creates a fresh task with these values.
+        loop = asyncio.get_running_loop()
+        run = loop.run_in_executor
+        clock = loop.time
+        executor = self._executor
+        collect = self._collect
+        send = self._send_fn
+        interval = self._interval
+        sleep = asyncio.sleep
+        # Loop-local: start() re-primes every new task, and a cancelled
+        # task must not write state back over its successor's.
+        primed = self._primed
+        deadline = clock()
         try:
             while True:
-                data = self._collect()
-                if data and self._send_fn:
-                    if self._primed:
-                        await self._send_fn(data)
+                data = await run(executor, collect)
+                if data and send:
+                    if primed:
+                        await send(data)
                     else:
                         # First tick: discard (CPU delta not yet valid)
-                        self._primed = True
-                await asyncio.sleep(self._interval)
+                        primed = True
+                # Sleep to a fixed cadence so collect/send time doesn't
+                # accumulate as drift; resync if we fell a full tick behind.
+                deadline += interval
+                now = clock()
+                if deadline <= now:
+                    deadline = now
+                await sleep(deadline - now)
         except asyncio.CancelledError:
             pass
         except Exception as e:
@@ -99,7 +145,7 @@ class TelemetryCollector:
             return
 
         # CPU temperature: k10temp (AMD) or coretemp (Intel)
-        for hwmon in glob.glob("/sys/class/hwmon/hwmon*"):
+        for hwmon in _list_numbered("/sys/class/hwmon", "hwmon"):
             name = _read_file(os.path.join(hwmon, "name")).strip()
             if name in ("k10temp", "coretemp"):
                 self._cpu_temp_path = os.path.join(hwmon, "temp1_input")
@@ -121,12 +167,12 @@ class TelemetryCollector:
                 self._power_avg_path = inp
 
         # GPU paths (AMDGPU — card0 or card1)
-        for card in sorted(glob.glob("/sys/class/drm/card[0-9]")):
+        for card in _list_numbered("/sys/class/drm", "card"):
             busy = os.path.join(card, "device", "gpu_busy_percent")
             if os.path.exists(busy):
                 self._gpu_busy_path = busy
                 # GPU temperature
-                for hwmon in glob.glob(os.path.join(card, "device", "hwmon", "hwmon*")):
+                for hwmon in _list_numbered(os.path.join(card, "device", "hwmon"), "hwmon"):
                     temp = os.path.join(hwmon, "temp1_input")
                     if os.path.exists(temp):
                         self._gpu_temp_path = temp
@@ -149,23 +195,104 @@ class TelemetryCollector:
                 break
 
         # Battery
-        bats = glob.glob("/sys/class/power_supply/BAT*")
+        try:
+            with os.scandir("/sys/class/power_supply") as it:
+                bats = sorted(e.path for e in it if e.name.startswith("BAT"))
+        except OSError:
+            bats = []
         if bats:
-            self._battery_path = bats[0]
+            self._bat_capacity_path = os.path.join(bats[0], "capacity")
+            self._bat_status_path = os.path.join(bats[0], "status")
 
         # CPU frequency paths
-        self._cpu_freq_paths = glob.glob(
-            "/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq"
+        self._cpu_freq_paths = [
+            freq for freq in (
+                os.path.join(cpu, "cpufreq", "scaling_cur_freq")
+                for cpu in _list_numbered("/sys/devices/system/cpu", "cpu")
+            )
+            if os.path.exists(freq)
+        ]
+
+        self._open_fds()
+        self._paths_resolved = True
+
+    def _open_fds(self) -> None:
+        """Open every resolved single-value node once; ticks then only pread."""
+        paths = (
+            "/proc/stat", "/proc/meminfo",
+            self._cpu_temp_path, self._fan_path,
+            self._power_cap_path, self._power_avg_path,
+            self._gpu_busy_path, self._gpu_temp_path,
+            self._gpu_freq_path, self._gpu_mem_freq_path,
+            self._vram_used_path, self._vram_total_path,
+            self._bat_capacity_path, self._bat_status_path,
         )
+        for path in paths:
+            if path:
+                self._open_fd(path)
+        self._cpu_freq_fds = [
+            self._fds[path] for path in self._cpu_freq_paths
+            if self._open_fd(path)
+        ]
+
+    def _open_fd(self, path: str) -> bool:
+        """Open and cache an fd for path. Returns False if it can't be opened."""
+        if path in self._fds:
+            return True
+        try:
+            self._fds[path] = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return False
+        return True
+
+    def _close_fds(self) -> None:
+        """Close cached fds. Paths are re-resolved on the next collection."""
+        for fd in self._fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
+        self._cpu_freq_fds = []
+        self._paths_resolved = False
+
+    def _read(self, path: str, size: int = 4096) -> bytes:
+        """Read a node through its cached fd, falling back to a plain open."""
+        fd = self._fds.get(path)
+        if fd is None:
+            return _read_file(path).encode()
+        try:
+            return _pread(fd, size)
+        except OSError as e:
+            self._mark_stale(e)
+            return b""
+
+    def _read_int(self, path: str) -> Optional[int]:
+        """Read an integer node through its cached fd."""
+        fd = self._fds.get(path)
+        if fd is None:
+            return _read_int(path)
+        try:
+            return _pread_int(fd)
+        except OSError as e:
+            self._mark_stale(e)
+            return None
 
-        self._paths_resolved = True
+    def _mark_stale(self, err: OSError) -> None:
+        """Flag cached paths for re-resolution if the node's device went away."""
+        if err.errno == errno.ENODEV:
+            self._paths_stale = True
 
     # ── Collect all metrics ──────────────────────────────────────────────────
 
     def _collect(self) -> dict:
         """Collect all available metrics into the canonical telemetry structure."""
+        if self._paths_stale:
+            # A hwmon/DRM device re-enumerated (dock, eGPU) — start over.
+            self._paths_stale = False
+            self._close_fds()
         self._resolve_paths()
-        ts = int(time.time() * 1000)  # Unix millis
+        ts = time.time_ns() // 1_000_000  # Unix millis
 
         data: dict = {"timestamp": ts}
 
@@ -202,12 +329,13 @@ class TelemetryCollector:
 
         # Usage from /proc/stat (delta-based)
         try:
-            line = _read_file("/proc/stat").split("\n", 1)[0]  # "cpu  user nice system idle ..."
-            parts = line.split()
+            # Only the aggregate first line is needed: "cpu  user nice system idle ..."
+            buf = self._read("/proc/stat", 512)
+            end = buf.find(b"\n")
+            parts = (buf[:end] if end != -1 else buf).split()
             if len(parts) >= 5:
-                values = [int(x) for x in parts[1:]]
-                idle = values[3]
-                total = sum(values)
+                idle = int(parts[4])
+                total = sum(map(int, parts[1:]))
 
                 if self._prev_total > 0:
                     d_idle = idle - self._prev_idle
@@ -221,21 +349,25 @@ class TelemetryCollector:
         except Exception:
             pass
 
-        # Temperature
+        # Temperature (millidegrees → °C, one decimal via integer rounding)
         if self._cpu_temp_path:
-            val = _read_int(self._cpu_temp_path)
+            val = self._read_int(self._cpu_temp_path)
             if val is not None:
-                result["tempCelsius"] = round(val / 1000.0, 1)
+                result["tempCelsius"] = ((val + 50) // 100) / 10.0
 
         # Frequency (average across all cores)
         try:
-            freqs = []
-            for path in self._cpu_freq_paths:
-                val = _read_int(path)
+            total = 0
+            count = 0
+            for fd in self._cpu_freq_fds:
+                val = _pread_int(fd)
                 if val is not None:
-                    freqs.append(val)
-            if freqs:
-                result["freqMHz"] = round(sum(freqs) / len(freqs) / 1000.0, 0)
+                    total += val
+                    count += 1
+            if count:
+                result["freqMHz"] = round(total / count / 1000.0, 0)
+        except OSError as e:
+            self._mark_stale(e)
         except Exception:
             pass
 
@@ -248,87 +380,47 @@ class TelemetryCollector:
 
         # Usage
         if self._gpu_busy_path:
-            val = _read_int(self._gpu_busy_path)
+            val = self._read_int(self._gpu_busy_path)
             if val is not None:
                 result["usagePercent"] = float(val)
 
         # Temperature
         if self._gpu_temp_path:
-            val = _read_int(self._gpu_temp_path)
+            val = self._read_int(self._gpu_temp_path)
             if val is not None:
-                result["tempCelsius"] = round(val / 1000.0, 1)
+                result["tempCelsius"] = ((val + 50) // 100) / 10.0
 
         # Core frequency from pp_dpm_sclk (active level marked with *)
         if self._gpu_freq_path:
-            freq = self._read_dpm_freq(self._gpu_freq_path)
+            freq = _parse_dpm_freq(self._read(self._gpu_freq_path))
             if freq is not None:
                 result["freqMHz"] = freq
 
         # Memory frequency from pp_dpm_mclk
         if self._gpu_mem_freq_path:
-            mclk = self._read_dpm_freq(self._gpu_mem_freq_path)
+            mclk = _parse_dpm_freq(self._read(self._gpu_mem_freq_path))
             if mclk is not None:
                 result["memFreqMHz"] = mclk
 
         # VRAM
         if self._vram_total_path:
-            vram_total = _read_int(self._vram_total_path)
+            vram_total = self._read_int(self._vram_total_path)
             if vram_total is not None:
                 result["vramTotalBytes"] = vram_total
             if self._vram_used_path:
-                vram_used = _read_int(self._vram_used_path)
+                vram_used = self._read_int(self._vram_used_path)
                 if vram_used is not None:
                     result["vramUsedBytes"] = vram_used
 
         return result if result else None
 
-    @staticmethod
-    def _read_dpm_freq(path: str) -> Optional[float]:
-        """Parse active frequency from pp_dpm_sclk/pp_dpm_mclk.
-        Looks for the line marked with *, falls back to the last entry."""
-        try:
-            content = _read_file(path).strip()
-            if not content:
-                return None
-            last_freq: Optional[float] = None
-            for line in content.split("\n"):
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) < 2:
-                    continue
-                cleaned = parts[1].lower().replace("mhz", "")
-                try:
-                    freq = float(cleaned)
-                except ValueError:
-                    continue
-                if "*" in line:
-                    return freq
-                last_freq = freq
-            return last_freq
-        except Exception:
-            pass
-        return None
-
     # ── Memory ────────────────────────────────────────────────────────────────
 
     def _read_memory(self) -> Optional[dict]:
         try:
-            content = _read_file("/proc/meminfo")
-            total_kb = 0
-            available_kb = 0
-            swap_total_kb = 0
-            swap_free_kb = 0
-            for line in content.split("\n"):
-                if line.startswith("MemTotal:"):
-                    total_kb = int(line.split()[1])
-                elif line.startswith("MemAvailable:"):
-                    available_kb = int(line.split()[1])
-                elif line.startswith("SwapTotal:"):
-                    swap_total_kb = int(line.split()[1])
-                elif line.startswith("SwapFree:"):
-                    swap_free_kb = int(line.split()[1])
+            total_kb, available_kb, swap_total_kb, swap_free_kb = _parse_meminfo(
+                self._read("/proc/meminfo")
+            )
             if total_kb > 0:
                 total_bytes = total_kb * 1024
                 available_bytes = available_kb * 1024
@@ -349,11 +441,11 @@ class TelemetryCollector:
     # ── Battery ───────────────────────────────────────────────────────────────
 
     def _read_battery(self) -> Optional[dict]:
-        if not self._battery_path:
+        if not self._bat_capacity_path:
             return None
         try:
-            capacity = _read_int(os.path.join(self._battery_path, "capacity"))
-            status = _read_file(os.path.join(self._battery_path, "status")).strip()
+            capacity = self._read_int(self._bat_capacity_path)
+            status = self._read(self._bat_status_path).strip().decode("ascii", "replace")
             if capacity is not None:
                 return {"capacity": capacity, "status": status}
         except Exception:
@@ -365,15 +457,16 @@ class TelemetryCollector:
     def _read_power(self) -> Optional[dict]:
         result: dict = {}
 
+        # Microwatts → W, one decimal via integer rounding
         if self._power_cap_path:
-            val = _read_int(self._power_cap_path)
+            val = self._read_int(self._power_cap_path)
             if val is not None:
-                result["tdpWatts"] = round(val / 1_000_000.0, 1)
+                result["tdpWatts"] = ((val + 50_000) // 100_000) / 10.0
 
         if self._power_avg_path:
-            val = _read_int(self._power_avg_path)
+            val = self._read_int(self._power_avg_path)
             if val is not None:
-                result["powerWatts"] = round(val / 1_000_000.0, 1)
+                result["powerWatts"] = ((val + 50_000) // 100_000) / 10.0
 
         return result if result else None
 
@@ -381,7 +474,7 @@ class TelemetryCollector:
 
     def _read_fan(self) -> Optional[dict]:
         if self._fan_path:
-            val = _read_int(self._fan_path)
+            val = self._read_int(self._fan_path)
             if val is not None:
                 return {"rpm": val}
         return None
@@ -389,6 +482,24 @@ class TelemetryCollector:
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
+def _list_numbered(parent: str, prefix: str) -> list[str]:
+    """List parent/<prefix><N> entries in numeric order with one scandir pass.
+
+    Replaces glob patterns like "hwmon*" / "card[0-9]" without fnmatch.
+    """
+    n = len(prefix)
+    try:
+        with os.scandir(parent) as it:
+            names = [
+                e.name for e in it
+                if e.name.startswith(prefix) and e.name[n:].isdigit()
+            ]
+    except OSError:
+        return []
+    names.sort(key=lambda name: int(name[n:]))
+    return [os.path.join(parent, name) for name in names]
+
+
 def _read_file(path: str) -> str:
     """Read a sysfs/procfs file. Returns empty string on failure."""
     try:
@@ -399,11 +510,79 @@ def _read_file(path: str) -> str:
 
 
 def _read_int(path: str) -> Optional[int]:
-    """Read and parse an integer from a sysfs file."""
-    content = _read_file(path).strip()
-    if content:
-        try:
-            return int(content)
-        except ValueError:
-            pass
+    """Read and parse an integer from a sysfs file.
+
+    int() accepts bytes with surrounding whitespace, so the raw read is
+    parsed directly — no str decode or strip.
+    """
+    try:
+        with open(path, "rb", buffering=0) as f:
+            return int(f.read(32))
+    except (OSError, ValueError):
+        return None
+
+
+# /proc/meminfo keys we report, in the order the kernel prints them
+_MEMINFO_KEYS = (b"MemTotal:", b"MemAvailable:", b"SwapTotal:", b"SwapFree:")
+
+
+def _parse_meminfo(buf: bytes) -> list[int]:
+    """Extract the _MEMINFO_KEYS values (kB) from raw /proc/meminfo bytes.
+
+    Each key is located with bytes.find starting after the previous match,
+    so the buffer is scanned once and never split into lines. Missing keys
+    read as 0.
+    """
+    values = [0, 0, 0, 0]
+    pos = 0
+    for i, key in enumerate(_MEMINFO_KEYS):
+        start = buf.find(key, pos)
+        if start == -1:
+            continue
+        start += len(key)
+        end = buf.find(b"\n", start)
+        if end == -1:
+            end = len(buf)
+        values[i] = int(buf[start:end].split(None, 1)[0])
+        pos = end
+    return values
+
+
+def _pread(fd: int, size: int = 4096) -> bytes:
+    """Re-read a sysfs/procfs node from offset 0. Raises OSError."""
+    return os.pread(fd, size, 0)
+
+
+def _pread_int(fd: int) -> Optional[int]:
+    """Re-read an integer sysfs node from offset 0. Raises OSError."""
+    try:
+        return int(os.pread(fd, 32, 0))
+    except ValueError:
+        return None
+
+
+def _parse_dpm_freq(content: bytes) -> Optional[float]:
+    """Parse active frequency from pp_dpm_sclk/pp_dpm_mclk content.
+    Jumps straight to the line marked with *, falls back to the last entry."""
+    star = content.rfind(b"*")
+    if star != -1:
+        line_start = content.rfind(b"\n", 0, star) + 1
+        freq = _parse_dpm_line(content[line_start:star])
+        if freq is not None:
+            return freq
+    for line in reversed(content.split(b"\n")):
+        freq = _parse_dpm_line(line)
+        if freq is not None:
+            return freq
     return None
+
+
+def _parse_dpm_line(line: bytes) -> Optional[float]:
+    """Parse the MHz value of one "N: 1600Mhz" DPM level line."""
+    parts = line.split()
+    if len(parts) < 2:
+        return None
+    try:
+        return float(parts[1].lower().replace(b"mhz", b""))
+    except ValueError:
+        return None
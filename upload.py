@@ -4,6 +4,8 @@ Upload session state tracking.
 
 from __future__ import annotations
 
+import asyncio
+import os
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
@@ -13,6 +15,13 @@ if TYPE_CHECKING:
 class UploadSession:
     """Manages a file upload session."""
 
+    __slots__ = (
+        "id", "game_name", "total_size", "files", "transferred",
+        "current_file", "status", "install_path", "executable",
+        "tcp_server", "fds", "mkdir_cache", "last_notify_ts",
+        "chunks_since_notify", "write_future", "_inv_total",
+    )
+
     def __init__(self, upload_id: str, game_name: str, total_size: int, files: list):
         self.id = upload_id
         self.game_name = game_name
@@ -24,8 +33,42 @@ class UploadSession:
         self.install_path: Optional[str] = None
         self.executable: Optional[str] = None
         self.tcp_server: Optional[TcpDataServer] = None
+        # Write fd of the file being received (keyed by relative path), and
+        # directories already created, so chunks don't reopen/re-stat.
+        self.fds: dict[str, int] = {}
+        self.mkdir_cache: set[str] = set()
+        # Chunk write currently running on the upload-io pool, if any
+        self.write_future: Optional[asyncio.Future] = None
+        # Progress notification throttling for the WebSocket chunk path
+        self.last_notify_ts = 0.0
+        self.chunks_since_notify = 0
+        # total_size is fixed per session — precompute the percent scale
+        self._inv_total = 100.0 / total_size if total_size else 0.0
 
     def progress(self) -> float:
-        if self.total_size == 0:
+        # The scaled product can land just below 100 on completion
+        if self.transferred >= self.total_size:
             return 100.0
-        return (self.transferred / self.total_size) * 100
+        return self.transferred * self._inv_total
+
+    def close_files(self) -> None:
+        """Close every cached write fd. Safe to call more than once."""
+        fds = self.fds
+        self.fds = {}
+        for fd in fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    async def finish_writes(self) -> None:
+        """Wait out any in-flight chunk write, then close the cached fds.
+
+        Callers set status away from "active" first so no new write starts.
+        """
+        future = self.write_future
+        if future is not None:
+            # wait() neither raises the write's error (the chunk handler
+            # reports it) nor cancels the future if we are cancelled.
+            await asyncio.wait((future,))
+        self.close_files()
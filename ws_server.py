@@ -3,17 +3,65 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import logging
+from collections import deque
 from typing import Optional, TYPE_CHECKING
 
 import decky  # type: ignore
 
+try:
+    import websockets
+    from websockets.exceptions import ConnectionClosedOK
+except ImportError:
+    websockets = None  # type: ignore
+
+import json_codec
+
 from handlers import auth, info, upload, game, telemetry, console_log, filesystem
 
 if TYPE_CHECKING:
     from main import Plugin
 
+MAX_MESSAGE_SIZE = 50 * 1024 * 1024
+
+# Backlog beyond which droppable messages (telemetry, log streams) are shed
+# instead of queued; replies and events are never dropped.
+SEND_QUEUE_SOFT_LIMIT = 256
+
+# Frames are received undecoded, so text and binary both arrive as bytes.
+# Binary frames start with a 4-byte big-endian header length, and since a
+# frame can't exceed MAX_MESSAGE_SIZE (< 64 MiB) their first byte is <= 0x03;
+# JSON text always starts with "{" or whitespace, both above that.
+_BINARY_FIRST_BYTE_MAX = MAX_MESSAGE_SIZE >> 24
+
+# Shared stand-in for a missing payload (handlers only read payloads).
+_EMPTY: dict = {}
+
+# Fixed-shape reply: format bytes directly instead of building a dict.
+_PONG = b'{"id":%s,"type":"pong"}'
+
+
+# Error replies: the envelope is fixed, and the body of the common static
+# errors is encoded once at import.
+_ERROR = b'{"id":%s,"type":"error","error":%s}'
+_STATIC_ERRORS = {
+    (code, message): json_codec.dumpb({"code": code, "message": message})
+    for code, message in (
+        (401, "Not authorized"),
+        (404, "Upload not found"),
+        (400, "Use binary frame for chunk data"),
+    )
+}
+
+
+async def _handle_ping(
+    server: WebSocketServer, websocket, msg_id: str, payload: dict
+) -> None:
+    server.send_raw(_PONG % json_codec.dumpb(msg_id))
+
+
 HANDLERS = {
+    "ping": _handle_ping,
     "get_info": info.handle_get_info,
     "get_config": info.handle_get_config,
     "get_steam_users": info.handle_get_steam_users,
@@ -35,6 +83,55 @@ HANDLERS = {
 }
 
 
+class _SendQueue:
+    """Outbound message buffer for one connection's write pump.
+
+    Single producer side (the loop), single consumer (the pump): a deque
+    plus one wakeup future is all that's needed, without asyncio.Queue's
+    getter/putter bookkeeping on every message.
+    """
+
+    __slots__ = ("items", "_waiter", "closed")
+
+    def __init__(self):
+        self.items: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self.closed = False
+
+    def put_nowait(self, data) -> None:
+        if self.closed:
+            return
+        self.items.append(data)
+        self._wake()
+
+    def offer(self, data) -> bool:
+        """Queue a message that may be dropped; False if the socket is backlogged."""
+        if len(self.items) >= SEND_QUEUE_SOFT_LIMIT:
+            decky.logger.debug("Send queue backlogged, dropping stream message")
+            return False
+        self.put_nowait(data)
+        return True
+
+    def close(self) -> None:
+        """Stop accepting messages; the pump exits once drained."""
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def wait(self) -> None:
+        """Block until a message is queued or the queue is closed."""
+        while not self.items and not self.closed:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+
 class WebSocketServer:
     """WebSocket server for Hub connections."""
 
@@ -44,7 +141,7 @@ class WebSocketServer:
         self.actual_port: int = 0
         self.connected_hub: Optional[dict] = None
         self.uploads: dict = {}
-        self._send_queue: Optional[asyncio.Queue] = None
+        self._send_queue: Optional[_SendQueue] = None
         self._write_task: Optional[asyncio.Task] = None
         self._active_websocket = None
         self._pending_artwork: dict[str, dict] = {}
@@ -55,16 +152,17 @@ class WebSocketServer:
             decky.logger.info("WebSocket server already running")
             return True
 
-        try:
-            import websockets
-        except ImportError:
+        if websockets is None:
             decky.logger.error("websockets package not found")
             return False
 
         try:
             self.server = await websockets.serve(
                 self.handle_connection, "0.0.0.0", 0,
-                max_size=50 * 1024 * 1024, reuse_address=True,
+                max_size=MAX_MESSAGE_SIZE, reuse_address=True,
+                # Traffic is small JSON and already-compressed game/artwork
+                # bytes; permessage-deflate would only burn CPU per frame.
+                compression=None,
             )
             self.actual_port = self.server.sockets[0].getsockname()[1]
             decky.logger.info(f"WebSocket server started on port {self.actual_port}")
@@ -88,15 +186,31 @@ class WebSocketServer:
             self.server = None
             decky.logger.info("WebSocket server stopped")
 
-    async def _write_pump(self, websocket, send_queue: asyncio.Queue):
+    async def _write_pump(self, websocket, send_queue: _SendQueue):
+        # Wake once per burst and send everything queued since. Each message
+        # keeps its own frame — the Hub expects one JSON object per text frame.
+        # Loop invariants bound to locals once per connection.
+        items = send_queue.items
+        popleft = items.popleft
+        send = websocket.send
+        is_enabled_for = decky.logger.isEnabledFor
+        debug = logging.DEBUG
         try:
             while True:
-                msg_data = await send_queue.get()
-                if msg_data is None:  # Shutdown signal
-                    break
+                if not items:
+                    if send_queue.closed:
+                        break
+                    await send_queue.wait()
+                    continue
+                msg_data = popleft()
                 try:
-                    await websocket.send(msg_data)
-                    decky.logger.info(f"WS SENT: {msg_data[:100]}...")
+                    # Messages are pre-encoded UTF-8 JSON; text=True keeps
+                    # them text frames without a decode/re-encode round trip.
+                    await send(msg_data, text=True)
+                    if is_enabled_for(debug):
+                        decky.logger.debug(
+                            "WS SENT: %s...", msg_data[:100].decode("utf-8", "replace")
+                        )
                 except Exception as e:
                     decky.logger.error(f"Write error: {e}")
                     break
@@ -111,26 +225,45 @@ class WebSocketServer:
         hub_id = None
         self._active_websocket = websocket
 
-        send_queue = asyncio.Queue()
+        send_queue = _SendQueue()
         write_task = asyncio.create_task(self._write_pump(websocket, send_queue))
         self._send_queue = send_queue
         self._write_task = write_task
 
+        recv = websocket.recv
         try:
-            async for message in websocket:
+            while True:
+                try:
+                    # decode=False skips websockets' UTF-8 decode of text
+                    # frames; the JSON decoder reads the bytes directly.
+                    message = await recv(decode=False)
+                except ConnectionClosedOK:
+                    break
                 try:
-                    if isinstance(message, bytes):
+                    first = message[0] if message else 0
+                    if first <= _BINARY_FIRST_BYTE_MAX:
                         await upload.handle_binary(self, websocket, message)
                         continue
 
-                    msg = json.loads(message)
+                    # Every protocol message is a JSON object; reject anything
+                    # else (e.g. truncated frames) without a parser exception.
+                    if first != 0x7B and message.lstrip()[:1] != b"{":
+                        decky.logger.error("Failed to parse JSON message")
+                        continue
+
+                    msg = json_codec.loads(message)
                     msg_type = msg.get("type")
-                    msg_id = msg.get("id", "")
-                    payload = msg.get("payload", {})
+                    msg_id = msg.get("id") or ""
+                    payload = msg.get("payload") or _EMPTY
 
-                    decky.logger.info(f"WS RECV [{msg_type}] id={msg_id}")
+                    decky.logger.debug("WS RECV [%s] id=%s", msg_type, msg_id)
 
-                    if msg_type == "hub_connected":
+                    # Authorized traffic is one table lookup; the handshake
+                    # types aren't in HANDLERS and fall through below.
+                    handler = HANDLERS.get(msg_type) if authorized else None
+                    if handler:
+                        await handler(self, websocket, msg_id, payload)
+                    elif msg_type == "hub_connected":
                         hub_id, authorized = await auth.handle_hub_connected(
                             self, websocket, msg_id, payload
                         )
@@ -140,16 +273,10 @@ class WebSocketServer:
                         )
                     elif not authorized:
                         await self.send_error(websocket, msg_id, 401, "Not authorized")
-                    elif msg_type == "ping":
-                        await self.send(websocket, msg_id, "pong", None)
                     else:
-                        handler = HANDLERS.get(msg_type)
-                        if handler:
-                            await handler(self, websocket, msg_id, payload)
-                        else:
-                            decky.logger.warning(f"Unknown message type: {msg_type}")
+                        decky.logger.warning(f"Unknown message type: {msg_type}")
 
-                except json.JSONDecodeError:
+                except json_codec.JSONDecodeError:
                     decky.logger.error("Failed to parse JSON message")
                 except Exception as e:
                     decky.logger.error(f"Error handling message: {e}")
@@ -159,7 +286,7 @@ class WebSocketServer:
         finally:
             self._active_websocket = None
 
-            await send_queue.put(None)
+            send_queue.close()
             write_task.cancel()
             try:
                 await write_task
@@ -177,7 +304,7 @@ class WebSocketServer:
 
             await upload.cleanup_orphaned_uploads(self)
 
-            self._pending_artwork.clear()
+            self._pending_artwork = {}
 
             if self.connected_hub and self.connected_hub.get("id") == hub_id:
                 telemetry.stop_telemetry(self)
@@ -191,14 +318,21 @@ class WebSocketServer:
                     decky.logger.error(f"Failed to notify hub_disconnected: {e}")
             decky.logger.info(f"Connection closed: {websocket.remote_address}")
 
+    def send_raw(self, data: bytes) -> None:
+        """Queue an already-encoded JSON message (fast path for fixed shapes)."""
+        if self._send_queue:
+            self._send_queue.put_nowait(data)
+        else:
+            decky.logger.error("Send queue not initialized!")
+
     async def send(self, websocket, msg_id: str, msg_type: str, payload):
         msg = {"id": msg_id, "type": msg_type}
         if payload is not None:
             msg["payload"] = payload
-        json_str = json.dumps(msg)
-        decky.logger.info(f"WS QUEUE [{msg_type}] id={msg_id}")
+        data = json_codec.dumpb(msg)
+        decky.logger.debug("WS QUEUE [%s] id=%s", msg_type, msg_id)
         if self._send_queue:
-            await self._send_queue.put(json_str)
+            self._send_queue.put_nowait(data)
         else:
             decky.logger.error("Send queue not initialized!")
 
@@ -206,18 +340,13 @@ class WebSocketServer:
         """Send an unsolicited event to the connected Hub (no msg_id needed)."""
         msg = {"id": "", "type": msg_type, "payload": payload}
         if self._send_queue:
-            await self._send_queue.put(json.dumps(msg))
+            self._send_queue.put_nowait(json_codec.dumpb(msg))
             decky.logger.info(f"WS EVENT [{msg_type}]")
         else:
             decky.logger.warning(f"Cannot send event {msg_type}: no active connection")
 
     async def send_error(self, websocket, msg_id: str, code: int, message: str):
-        msg = {
-            "id": msg_id,
-            "type": "error",
-            "error": {"code": code, "message": message},
-        }
-        if self._send_queue:
-            await self._send_queue.put(json.dumps(msg))
-        else:
-            decky.logger.error("Send queue not initialized!")
+        body = _STATIC_ERRORS.get((code, message))
+        if body is None:
+            body = json_codec.dumpb({"code": code, "message": message})
+        self.send_raw(_ERROR % (json_codec.dumpb(msg_id), body))